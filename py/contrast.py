@@ -6,7 +6,14 @@
 # Doesn't work super great.
 # Correlation between contrast and readability is meh.  Would probably be better to just sweep and print some examples.
 
+from array import array
+from bisect import bisect
+import sys
+
 steps=20000
+# Sample the RGB cube with a Halton sequence instead of a fixed stride.
+# Low-discrepancy points cover it evenly, so steps//8 of them is plenty.
+halton=True
 # luminance max / luminance min
 # is ~contrast
 conThresh=1.8
@@ -17,71 +24,150 @@ foregrounds=[0x839496,
 backgrounds=[0x002b36]
 
 def decToRGB(dec):
-    r=dec//(2**16)
-    g=( dec//(2**8) ) % ( 2**8 )
-    b=dec % ( 2**8 )
-    return(r,g,b)
+    return (dec>>16, (dec>>8)&0xff, dec&0xff)
+
+# Per-channel luminance contributions, one entry per possible byte value.
+# Saves three pow() calls per lum().  Left as floats: the sweep rejects
+# with a bisect, not arithmetic, and the printed contrasts want full
+# precision, so a fixed-point table wouldn't buy anything.
+gamma=2.2
+POW22=tuple(i ** gamma for i in range(256))
+LUT_R=tuple(0.2126 * p for p in POW22)
+LUT_G=tuple(0.7152 * p for p in POW22)
+LUT_B=tuple(0.0722 * p for p in POW22)
 
 def lum(rgb):
-    (r,g,b)=decToRGB(rgb)
-    #print(f"rgb {rgb:0x} r {r:0x} g {g:0x} b {b:0x}")
-    gamma=2.2
-    return (0.2126 * ( r ** gamma )
-          + 0.7152 * ( g ** gamma )
-          + 0.0722 * ( b ** gamma ))
+    #print(f"rgb {rgb:0x} r {rgb>>16:0x} g {(rgb>>8)&0xff:0x} b {rgb&0xff:0x}")
+    return (LUT_R[rgb>>16]
+          + LUT_G[(rgb>>8)&0xff]
+          + LUT_B[rgb&0xff])
 
 def cont(lum1, lum2):
-    if lum2 != 0 and lum1 != 0:
-        contrast=lum1/lum2
-    else:
-        return 0
-    if contrast < 1 :
-        contrast = 1/contrast
-    return contrast
-
-def cprint(fore,back):
-    (fr,fg,fb)=decToRGB(fore)
-    (br,bg,bb)=decToRGB(back)
-#    print(f"cprint fore {hex(fore)} fr {hex(fr)} fg {hex(fg)}  fb {hex(fb)} back {hex(back)} br {hex(br)} bg {hex(bg)}  bb {hex(bb)}")
-#    print(f";{fr};{fg};{fb}  {br};{bg};{bb}")
-    print(f"{cont(lum(fore),lum(back)):6.2f} cont : fore 0x{int(fore):06x} back 0x{int(back):06x}   \033[38;2;{fr};{fg};{fb}m\033[48;2;{br};{bg};{bb}mthis is the     sample text\033[0m  ", end="")
+    # brighter over darker, one divide; pure black has no contrast ratio
+    hi = lum1 if lum1 > lum2 else lum2
+    lo = lum2 if lum1 > lum2 else lum1
+    return hi/lo if lo else 0
+
+SAMPLE_TEXT="this is the     sample text\033[0m  "
+
+# Returns the sample rather than printing it, so callers can write a
+# whole row at once.  Luminances come in precomputed and cont() is
+# inlined, so nothing gets unpacked or looked up twice.
+def cprint(fore,back,foreLum,backLum):
+    # palette colors have their escape prebuilt, only the swept one is new
+    foreSGR=FORE_SGR.get(fore)
+    if foreSGR is None :
+        foreSGR=f"\033[38;2;{fore>>16};{(fore>>8)&0xff};{fore&0xff}m"
+    backSGR=BACK_SGR.get(back)
+    if backSGR is None :
+        backSGR=f"\033[48;2;{back>>16};{(back>>8)&0xff};{back&0xff}m"
+#    print(f"cprint fore {hex(fore)} back {hex(back)} foreLum {foreLum} backLum {backLum}")
+    if foreLum and backLum :
+        contrast = foreLum/backLum if foreLum > backLum else backLum/foreLum
+    else :
+        contrast = 0
+    return "%6.2f cont : fore 0x%06x back 0x%06x   %s%s" % (contrast, fore, back, foreSGR, backSGR) + SAMPLE_TEXT
 #    print(f"\033[38;2;255;0;0m[48;2;{br};{bg};{bb}mthis is the     sample text\033[0m")
 
 #print(f"\033[38;2;240;100;200m\033[48;2;200;255;50mHello World!\033[0m")
 #print(f"\033[38;2;255;101;101m\033[48;2;0;0;0mthis is the     sample text\033[0m")
 #exit(1)
 
-lums={}
-for color in foregrounds + backgrounds :
-    lums[color]=lum(color)
-    #print(f"color {color} lum {lums}")
-
-for color in range(0,0xFFFFFF,0xFFFFFF//steps) :
-    #print("checking "+hex(color))
-    mylum=lum(color)
-    minCont=1000
-    for fore in foregrounds :
-        contrast=cont(lums[fore], lum(color))
-        if contrast < minCont :
-            minCont = contrast
-    for back in backgrounds :
-        contrast=cont(lum(color), lums[back])
-        if contrast < minCont :
-            minCont = contrast
-    if minCont > conThresh :
-        print(f"{minCont:6.2f} minCont : ", end="")
-        for fore in foregrounds :
+# Palette split into parallel per-channel tuples, unpacked once here
+# instead of on every lookup.
+(foreR,foreG,foreB)=zip(*map(decToRGB, foregrounds))
+(backR,backG,backB)=zip(*map(decToRGB, backgrounds))
+
+# ANSI truecolor escapes for the palette, built once
+FORE_SGR={c: f"\033[38;2;{r};{g};{b}m" for c,r,g,b in zip(foregrounds, foreR, foreG, foreB)}
+BACK_SGR={c: f"\033[48;2;{r};{g};{b}m" for c,r,g,b in zip(backgrounds, backR, backG, backB)}
+
+# Palette luminances, by position in foregrounds/backgrounds
+foreLums=tuple(LUT_R[r] + LUT_G[g] + LUT_B[b] for r,g,b in zip(foreR, foreG, foreB))
+backLums=tuple(LUT_R[r] + LUT_G[g] + LUT_B[b] for r,g,b in zip(backR, backG, backB))
+#print(f"foreLums {foreLums} backLums {backLums}")
+
+# i-th element of the van der Corput sequence in the given base
+def radicalInverse(i, base):
+    r=0
+    f=1
+    while i > 0 :
+        f/=base
+        r+=f * ( i % base )
+        i//=base
+    return r
+
+# n colors from the 3D Halton sequence (bases 2, 3, 5), in color order
+def haltonColors(n):
+    return sorted({ int(radicalInverse(i,2)*256)<<16
+                  | int(radicalInverse(i,3)*256)<<8
+                  | int(radicalInverse(i,5)*256) for i in range(1,n+1) })
+
+# Sweep first, print after: the filter pass does no formatting or I/O.
+# Pure numeric kernel; everything it needs comes in as arguments.
+# cont() is symmetric, so fore vs back doesn't matter here and the whole
+# palette is just one flat tuple of luminances.
+def sweep(palLums, thresh, colors):
+    # A color within a factor of thresh of any palette luminance can't
+    # pass, so merge those bands once and reject with a single bisect.
+    # Bands are shrunk a hair so float rounding never rejects a color the
+    # exact check below would keep.
+    edges=[]
+    for lo, hi in sorted((p/thresh*(1+1e-9), p*thresh/(1+1e-9)) for p in palLums if p) :
+        if edges and lo <= edges[-1] :
+            edges[-1]=max(edges[-1], hi)
+        else :
+            edges+=[lo, hi]
+
+    # locals are cheaper than globals in the loop
+    _bisect=bisect
+    _cont=cont
+    matches=[]
+    _append=matches.append
+    # all candidate luminances up front, packed as plain doubles
+    colorLums=array('d', map(lum, colors))
+    for color, mylum in zip(colors, colorLums) :
+        #print("checking "+hex(color))
+        if not mylum or _bisect(edges, mylum) & 1 :
+            continue
+        minCont=1000
+        for palLum in palLums :
+            contrast=_cont(palLum, mylum)
+            # most colors fail on the first entry, no need to look further
+            if contrast <= thresh :
+                break
+            if contrast < minCont :
+                minCont = contrast
+        else :
+            _append((color, mylum, minCont))
+    return matches
+
+if halton :
+    candidates=haltonColors(steps//8)
+else :
+    candidates=range(0,0xFFFFFF,0xFFFFFF//steps)
+matches=sweep(foreLums + backLums, conThresh, candidates)
+
+def printMatches(matches, fores, foreLums, backs, backLums):
+    _cprint=cprint
+    write=sys.stdout.write
+    for color, mylum, minCont in matches :
+        row=[f"{minCont:6.2f} minCont : "]
+        for fore, foreLum in zip(fores, foreLums) :
             #print(f"fore {hex(fore)} color {hex(color)}")
-            cprint(fore, color)
+            row.append(_cprint(fore, color, foreLum, mylum))
 #            print("test")
 #            cprint(int(0xFF0000), int(0x0))
         #print(".")
-        for back in backgrounds :
+        for back, backLum in zip(backs, backLums) :
             #print(f"color {hex(color)} back {hex(back)}")
-            cprint(color, back)
-        print("")
+            row.append(_cprint(color, back, mylum, backLum))
+        row.append("\n")
+        write("".join(row))
         #print("--")
 
+printMatches(matches, foregrounds, foreLums, backgrounds, backLums)
+
 #print(f"lum 10 10 10 {lum(0xabcdef)}")
 #print(f"\033[38;2;10;10;10m\033[0m\033[48;2;200;200;200mtext\033[0m")
 
@@ -92,13 +178,13 @@ print("")
 color=0x356900
 for fore in foregrounds :
     print(f"fore {hex(fore)} color {hex(color)} cont {cont(lum(fore),lum(color))}")
-    cprint(fore, color)
+    print(cprint(fore, color, lum(fore), lum(color)), end="")
     #            print("test")
     #            cprint(int(0xFF0000), int(0x0))
     print(".")
 for back in backgrounds :
     print(f"color {hex(color)} back {hex(back)} cont {cont(lum(back),lum(color))}")
-    cprint(color, back)
+    print(cprint(color, back, lum(color), lum(back)), end="")
 
 
 # color2 is the